@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
 import os
+import sys
 from pathlib import Path
 import dj_database_url
 from dotenv import load_dotenv
@@ -24,6 +25,9 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 # Environment detection
 ENVIRONMENT = os.getenv('ENVIRONMENT', 'development')
 
+# Test run detection (manage.py test or pytest)
+TESTING = sys.argv[1:2] == ['test'] or 'pytest' in sys.modules
+
 # Secret key
 if ENVIRONMENT == "production":
     try:
@@ -106,7 +110,15 @@ TEMPLATES = [
 WSGI_APPLICATION = 'buddy_crocker.wsgi.application'
 
 # Database
-if ENVIRONMENT == "production":
+if TESTING:
+    # In-memory SQLite skips creating a database file on every run
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': ':memory:',
+        }
+    }
+elif ENVIRONMENT == "production":
     DATABASES = {
         'default': dj_database_url.config(
             conn_max_age=600,
@@ -168,6 +180,23 @@ if ENVIRONMENT == "production":
     # and renames the files with unique names for each version to support long-term caching
     STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 
+# Test Settings
+if TESTING:
+    # PBKDF2 is deliberately slow; tests only need a valid hash
+    PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+    # Build the schema straight from models instead of replaying every migration
+    class DisableMigrations:
+        """Report every app as having no migrations module."""
+        def __contains__(self, item):
+            return True
+
+        def __getitem__(self, item):
+            return None
+
+    MIGRATION_MODULES = DisableMigrations()
+    # Keep logins and session fixtures out of the database
+    SESSION_ENGINE = 'django.contrib.sessions.backends.cache'
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
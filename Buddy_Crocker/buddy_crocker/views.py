@@ -10,6 +10,7 @@ from django.contrib.auth.views import LoginView
 from django.core.paginator import Paginator
 from django.core.exceptions import ValidationError
 from django.db import IntegrityError, transaction
+from django.db.models import Prefetch, prefetch_related_objects
 from django.http import JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
@@ -109,11 +110,19 @@ def recipe_search(request):
     else:
         selected_allergen_ids = []
 
+    # Allergen checks read the prefetched tree instead of one query per recipe
+    if user_allergens:
+        recipes = recipes.prefetch_related("ingredients__allergens")
+
     # Add metadata to recipes
     for recipe in recipes:
         recipe.ingredient_count = recipe.ingredients.count()
         if request.user.is_authenticated and user_allergens:
-            recipe_allergens = recipe.get_allergens()
+            recipe_allergens = {
+                allergen
+                for ingredient in recipe.ingredients.all()
+                for allergen in ingredient.allergens.all()
+            }
             recipe.is_safe_for_user = not any(
                 allergen in user_allergens for allergen in recipe_allergens
             )
@@ -138,10 +147,20 @@ def recipe_search(request):
 
 def recipe_detail(request, pk):
     """Display recipe with calculated nutrition information."""
-    recipe = get_object_or_404(Recipe, pk=pk)
+    recipe = get_object_or_404(
+        Recipe.objects.select_related("author").prefetch_related(
+            Prefetch(
+                "recipe_ingredients",
+                queryset=RecipeIngredient.objects.select_related(
+                    "ingredient",
+                ).prefetch_related("ingredient__allergens"),
+            ),
+        ),
+        pk=pk,
+    )
 
-    # Get ingredients with amounts
-    recipe_ingredients = recipe.get_ingredient_list()
+    # Get ingredients with amounts (served from the prefetch above)
+    recipe_ingredients = recipe.recipe_ingredients.all()
 
     # Calculate nutrition
     total_calories = recipe.calculate_total_calories()
@@ -233,7 +252,7 @@ def ingredient_detail(request, pk):
     """Display detailed information about a specific ingredient."""
     ingredient = get_object_or_404(Ingredient, pk=pk)
     all_allergens = ingredient.allergens.all()
-    related_recipes = ingredient.recipes.all()
+    related_recipes = ingredient.recipes.select_related("author")
 
     user_allergens, _ = get_user_allergens(request.user)
     allergen_ctx = get_allergen_context(all_allergens, user_allergens)
@@ -252,9 +271,10 @@ def allergen_detail(request, pk):
     """Display detailed information about a specific allergen."""
     allergen = get_object_or_404(Allergen, pk=pk)
     affected_ingredients = allergen.ingredients.all()
+    # The template shows each recipe's author and ingredient count
     affected_recipes = Recipe.objects.filter(
         ingredients__allergens=allergen,
-    ).distinct()
+    ).distinct().select_related("author").prefetch_related("ingredients")
 
     can_add_to_profile = False
     already_in_profile = False
@@ -293,7 +313,9 @@ def pantry(request):
                 pantry_obj.ingredients.remove(ingredient)
         return redirect("pantry")
 
-    pantry_ingredients = pantry_obj.ingredients.all().prefetch_related("allergens")
+    # The template reads pantry.ingredients several times; fetch them once
+    prefetch_related_objects([pantry_obj], "ingredients__allergens")
+    pantry_ingredients = pantry_obj.ingredients.all()
     user_allergens, _ = get_user_allergens(request.user)
     show_allergen_warnings = bool(user_allergens)
 
@@ -313,9 +335,9 @@ def pantry(request):
         "unsafe_count": len(unsafe_ingredients),
         "safe_count": len(safe_ingredients),
         "all_ingredients": Ingredient.objects.all(),
-        "pantry_ingredient_ids": set(
-            pantry_obj.ingredients.values_list("id", flat=True),
-        ),
+        "pantry_ingredient_ids": {
+            ingredient.id for ingredient in pantry_ingredients
+        },
     }
     return render(request, "buddy_crocker/pantry.html", context)
 
@@ -513,7 +535,16 @@ def add_recipe(request):
         # print("FORM errors:", form.errors)
         # print("FORMSET errors:", formset.errors)
 
-        if form.is_valid() and formset.is_valid():
+        is_valid = form.is_valid() and formset.is_valid()
+
+        # author is not a form field, so unique_together is not checked for us
+        if is_valid and Recipe.objects.filter(
+            author_id=request.user.id, title=form.cleaned_data["title"],
+        ).exists():
+            form.add_error("title", "You already have a recipe with this title.")
+            is_valid = False
+
+        if is_valid:
             recipe = form.save(commit=False)
             recipe.author = request.user
             recipe.save()
@@ -562,15 +593,17 @@ def profile_detail(request, pk):
     user = get_object_or_404(User, pk=pk)
     profile, _ = Profile.objects.get_or_create(user=user)
     user_pantry, _ = Pantry.objects.get_or_create(user=user)
-    pantry_ingredient_ids = set(
-        user_pantry.ingredients.values_list("id", flat=True),
-    )
+    prefetch_related_objects([profile], "allergens")
+    prefetch_related_objects([user_pantry], "ingredients")
+    pantry_ingredient_ids = {
+        ingredient.id for ingredient in user_pantry.ingredients.all()
+    }
 
     safe_recipes = profile.get_safe_recipes()
     recipes_you_can_make = [
         recipe
-        for recipe in safe_recipes
-        if set(recipe.ingredients.values_list("id", flat=True)).issubset(
+        for recipe in safe_recipes.prefetch_related("ingredients")
+        if {ingredient.id for ingredient in recipe.ingredients.all()}.issubset(
             pantry_ingredient_ids,
         )
     ]
@@ -936,7 +969,8 @@ def ai_recipe_generator(request):
     Allows saving recipes and adding ingredients to shopping list.
     """
     pantry_obj, _ = Pantry.objects.get_or_create(user=request.user)
-    pantry_ingredients = pantry_obj.ingredients.all()
+    # The page and the AI prompt only need each ingredient's id and name
+    pantry_ingredients = pantry_obj.ingredients.only("id", "name")
 
     # Get selected ingredients from session ONLY (no default to all)
     selected_ingredient_ids = request.session.get("selected_pantry_ingredients", [])
@@ -1152,6 +1186,10 @@ def _save_recipe_for_user(user, recipe_data):
     if not ingredients_list:
         raise ValueError("Recipe must have at least one ingredient")
 
+    # A boolean lookup is cheaper than a failed INSERT and savepoint rollback
+    if Recipe.objects.filter(author_id=user.id, title=title).exists():
+        raise IntegrityError(f'Recipe "{title}" already exists for this user')
+
     with transaction.atomic():
         # Create the recipe - USE 'author' to match your model
         recipe = Recipe.objects.create(
@@ -1258,28 +1296,37 @@ def _add_recipe_to_shopping_list(request, recipe_data):
     Returns:
         int: Number of items successfully added
     """
-    added_count = 0
+    notes = f'From recipe: {recipe_data.get("title", "AI Generated")}'
+    new_items = {}
 
     for ingredient_text in recipe_data.get('ingredients', []):
+        # Parse ingredient text (you may need more sophisticated parsing)
+        item = ShoppingListItem(
+            user=request.user,
+            ingredient_name=ingredient_text.strip(),
+            quantity='',  # Could parse this from ingredient_text
+            notes=notes
+        )
         try:
-            # Parse ingredient text (you may need more sophisticated parsing)
-            ingredient_name = ingredient_text.strip()
-
-            ShoppingListItem.objects.create(
-                user=request.user,
-                ingredient_name=ingredient_name,
-                quantity='',  # Could parse this from ingredient_text
-                notes=f'From recipe: {recipe_data.get("title", "AI Generated")}'
-            )
-            added_count += 1
-        except IntegrityError:
-            # Item already exists, skip
-            continue
+            item.clean_fields(exclude=['user'])
+            item.clean()
         except ValidationError:
             # Invalid data, skip
             continue
+        new_items.setdefault(item.ingredient_name, item)
 
-    return added_count
+    # Items already on the list are skipped, as the unique constraint would
+    existing = ShoppingListItem.objects.filter(
+        user=request.user,
+        ingredient_name__in=list(new_items)
+    ).values_list('ingredient_name', flat=True)
+    for name in existing:
+        new_items.pop(name, None)
+
+    ShoppingListItem.objects.bulk_create(
+        new_items.values(), ignore_conflicts=True
+    )
+    return len(new_items)
 
 def _parse_ingredient_string(ing_str):
     """